@@ -0,0 +1,473 @@
+# contador_core.py
+# Parseo, puntaje y helpers de presentación de dinámicas (sin Streamlit); app.py solo arma la UI
+from collections import Counter
+import functools
+import itertools
+import re as _std_re
+import unicodedata
+
+# Recomendado para emojis compuestos (pip install regex)
+try:
+    import regex as re  # type: ignore
+    HAS_REGEX = True
+except Exception:
+    import re  # type: ignore
+    HAS_REGEX = False
+
+
+# Separadores de línea de str.splitlines() y el resto de espacios que quita str.strip()
+_LINE_SEP = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+_HSPACE = r"\t\x1f \xa0\u1680\u2000-\u200a\u202f\u205f\u3000"
+# Los patrones de líneas no necesitan \X: el re estándar los recorre más rápido que regex
+# Primera línea con texto (el encabezado)
+TITLE_RE = _std_re.compile(rf"(?:^|(?<=[{_LINE_SEP}]))[{_HSPACE}]*([^{_LINE_SEP}{_HSPACE}][^{_LINE_SEP}]*)")
+# Línea "N. ..." que abre una ronda; se busca sobre todo el texto de una vez
+ROUND_RE_MULTI = _std_re.compile(rf"(?<=[{_LINE_SEP}])[{_HSPACE}]*(\d+)\.([^{_LINE_SEP}]*)")
+# Un grapheme cluster (solo existe con el módulo regex)
+GRAPHEME_RE = re.compile(r"\X") if HAS_REGEX else None
+# Tokens de una línea de posiciones, en orden de prioridad:
+# grupo "(...)", "(" sin cerrar, ")" suelto, o 1 emoji (grapheme; sin regex, 1 carácter)
+PODIUM_RE = re.compile(
+    r"\((?P<grp>[^)]*)\)|(?P<open>\()|(?P<close>\))|(?P<solo>%s)" % (r"\X" if HAS_REGEX else "."),
+    re.S,
+)
+# Caracteres que no cuentan en líneas fuera del podio (se borran en una pasada)
+_STRIP_TABLE = str.maketrans("", "", " ()")
+
+# Equipos fijos (por ahora)
+TEAM_ORDER = ["❤️", "🧡", "🩶"]
+# Posición de cada equipo en la lista de totales
+TEAM_IDX = {emo: i for i, emo in enumerate(TEAM_ORDER)}
+TEAM_NAME = {
+    "❤️": "𝐅𝐞𝐫𝐫𝐚𝐫𝐢",
+    "🧡": "𝐌𝐜𝐋𝐚𝐫𝐞𝐧",
+    "🩶": "𝐌𝐞𝐫𝐜𝐞𝐝𝐞𝐬",
+}
+
+
+# ----------------------------
+# Helpers (texto / emojis)
+# ----------------------------
+def normalize_line(s: str) -> str:
+    # Lo pegado de WhatsApp casi siempre ya viene en NFC: el quick check evita recomponer.
+    # parse_input normaliza cada línea una sola vez; los helpers privados (_...)
+    # asumen líneas ya normalizadas y no lo repiten. Los públicos sí normalizan.
+    s = s.strip()
+    return s if unicodedata.is_normalized("NFC", s) else unicodedata.normalize("NFC", s)
+
+
+def split_graphemes(s: str) -> tuple[str, ...]:
+    """
+    Divide en 'grapheme clusters' para soportar emojis compuestos.
+    Si no hay regex, cae al fallback por caracteres.
+    """
+    return split_graphemes_raw(normalize_line(s).replace(" ", ""))
+
+
+@functools.lru_cache(maxsize=4096)
+def split_graphemes_raw(s: str) -> tuple[str, ...]:
+    """
+    Igual que split_graphemes, pero asume que `s` ya viene normalizado
+    y sin espacios (no vuelve a limpiarlo).
+    Cacheada (los mismos emojis se repiten ronda tras ronda); por eso regresa tupla.
+    """
+    if not s:
+        return ()
+    if s.isascii():
+        return tuple(s)  # en ASCII cada carácter es su propio grapheme
+    if not HAS_REGEX:
+        return tuple(s)  # el fallback por caracteres nunca quitó el ZWJ
+    graphemes = _segment_graphemes(s)
+    if "\u200d" not in s:
+        # sin ZWJ no puede quedar uno suelto: no hace falta filtrar
+        return tuple(graphemes)
+    return tuple(g for g in graphemes if g != "\u200d")
+
+
+def _segment_graphemes(s: str) -> list[str]:
+    """
+    Único segmentador de graphemes (sin filtrar ZWJ sueltos). Lo usan
+    split_graphemes_raw y el podio, para que un emoji se corte igual en
+    cualquier línea. Coincide con el token "solo" de PODIUM_RE.
+    """
+    return GRAPHEME_RE.findall(s) if HAS_REGEX else list(s)
+
+
+def parse_input(text: str):
+    """
+    title_raw = primera línea no vacía (ej. "Ahorcado - Areli 🐧")
+    rounds[ronda] = lista de líneas (strings) dentro de la ronda, en orden,
+                   donde rounds[ronda][0] es el podio (3 posiciones).
+    """
+    # encabezado
+    m = TITLE_RE.search(text)
+    if m is None:
+        return "", {}
+    title_raw = normalize_line(m.group(1))
+
+    rounds: dict[int, list[str]] = {}
+
+    # Un solo finditer ubica todas las rondas; lo que hay entre un "N." y el
+    # siguiente son las demás líneas de esa ronda. Lo anterior a la primera
+    # ronda se ignora.
+    headers = list(ROUND_RE_MULTI.finditer(text, m.end()))
+    for h, nxt in zip(headers, headers[1:] + [None]):
+        rn = int(h.group(1))
+        rest = normalize_line(h.group(2))  # podio puede venir aquí
+        lst = rounds.get(rn)
+        if lst is None:
+            lst = rounds[rn] = []
+            # Si el podio viene vacío (ej. "1."), la siguiente línea queda como podio
+            if rest:
+                lst.append(rest)
+        else:
+            lst.append(rest)
+
+        body = text[h.end(): nxt.start() if nxt else len(text)]
+        for line in body.splitlines():
+            line = normalize_line(line)
+            if line:  # separadores (incluye "líneas vacías" con espacios)
+                lst.append(line)
+
+    return title_raw, rounds
+
+
+# ----------------------------
+# Detección automática de formato
+# ----------------------------
+def detect_format(rounds: dict[int, list[str]]) -> str:
+    """
+    Detecta si el input es formato 'podio' (clásico) o 'lineal' (nuevo).
+
+    Formato PODIO (clásico):
+      - Cada ronda tiene EXACTAMENTE 3 posiciones en la primera línea (el podio)
+      - Puede tener líneas extra con emojis sueltos (60 pts c/u)
+      - Si TODAS las rondas tienen solo 1 línea con exactamente 3 posiciones -> podio
+
+    Formato LINEAL (nuevo):
+      - Cada ronda es UNA sola línea con N posiciones en orden
+      - Las posiciones son: 1ro=100, 2do=90, 3ro=80, resto=60
+      - Si alguna ronda tiene solo 1 línea con MÁS de 3 posiciones -> lineal
+
+    Heurística:
+      - Parsear las posiciones de la primera línea de cada ronda
+      - Si la mayoría tiene >3 posiciones -> lineal
+      - Si la mayoría tiene exactamente 3 -> podio
+
+    `rounds` debe venir de parse_input (líneas ya normalizadas).
+    """
+    if not rounds:
+        return "podio"
+
+    lineal_votes = 0
+    podio_votes = 0
+
+    for rn, lines in rounds.items():
+        if not lines:
+            continue
+        first_line = lines[0]
+        positions, _ = _parse_positions_line(first_line)
+        n = len(positions)
+
+        if n > 3:
+            lineal_votes += 1
+        elif n == 3 and len(lines) == 1:
+            # Podría ser cualquiera; si no hay líneas extra pesa poco
+            podio_votes += 1
+        elif n == 3 and len(lines) > 1:
+            # Tiene líneas extra -> claramente formato podio
+            podio_votes += 2
+        else:
+            # n < 3 o n == 0: ambiguo, no cuenta
+            pass
+
+    if lineal_votes > podio_votes:
+        return "lineal"
+    return "podio"
+
+
+# ----------------------------
+# Parser de posiciones (genérico, para ambos formatos)
+# ----------------------------
+def parse_positions_line(line_raw: str):
+    """
+    Convierte una línea de emojis/grupos en una lista de posiciones.
+    Cada posición es una lista de 1+ emojis (empate si >1).
+
+    Ej: "❤️(🧡🩶)🩶❤️" -> [["❤️"], ["🧡","🩶"], ["🩶"], ["❤️"]]
+
+    Validación: paréntesis deben contener EXACTAMENTE 2 emojis.
+    """
+    positions, errors = _parse_positions_line(normalize_line(line_raw))
+    return [list(pos) for pos in positions], list(errors)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_positions_line(line: str) -> tuple[tuple[tuple[str, ...], ...], tuple[str, ...]]:
+    """
+    Implementación cacheada de parse_positions_line (los podios se repiten
+    entre rondas). Regresa tuplas para que nadie modifique lo que está en caché;
+    el código interno la usa directo porque solo lee el resultado.
+    `line` ya debe venir normalizada (así salen de parse_input).
+    """
+    s = line.replace(" ", "")
+    if "(" not in s and ")" not in s:
+        # Sin paréntesis (el podio típico): cada grapheme es una posición, igual
+        # que el token "solo" de PODIUM_RE, sin pasar por el tokenizador
+        return tuple((g,) for g in _segment_graphemes(s)), ()
+
+    positions: list[tuple[str, ...]] = []
+    errors: list[str] = []
+
+    for m in PODIUM_RE.finditer(s):
+        kind = m.lastgroup
+
+        if kind == "solo":  # el caso común va primero
+            positions.append((m.group(),))
+        elif kind == "grp":
+            inside = m.group("grp")
+            # `inside` sale de `s`, ya sin espacios; quitarlos puede juntar una
+            # letra con su acento, por eso se vuelve a normalizar
+            emos = [e for e in split_graphemes_raw(normalize_line(inside)) if e not in ("(", ")")]
+
+            if len(emos) != 2:
+                errors.append(
+                    f"Grupo con paréntesis inválido: se esperaban EXACTAMENTE 2 emojis dentro de '(...)' "
+                    f"pero encontré {len(emos)} en: '({inside})'"
+                )
+
+            if emos:
+                positions.append(tuple(emos))
+        elif kind == "open":
+            errors.append("Paréntesis '(' sin cerrar.")
+        else:
+            errors.append("Paréntesis ')' suelto.")
+
+    return tuple(positions), tuple(errors)
+
+
+# Alias para compatibilidad con código existente
+def parse_podium_positions(podium_raw: str):
+    return parse_positions_line(podium_raw)
+
+
+def emojis_in_nonpodium_line(line: str) -> tuple[str, ...]:
+    """
+    Para líneas fuera del podio (formato clásico):
+    - contamos TODOS los emojis, aunque vengan en paréntesis
+    - quitamos paréntesis y contamos lo de adentro igual
+    """
+    return _emojis_in_nonpodium_line(normalize_line(line))
+
+
+@functools.lru_cache(maxsize=4096)
+def _emojis_in_nonpodium_line(line: str) -> tuple[str, ...]:
+    # Versión cacheada para líneas ya normalizadas (las de parse_input).
+    # Quitar espacios/paréntesis puede juntar una letra con su acento ("a (́" -> "á"),
+    # así que se vuelve a normalizar; el quick check lo deja casi gratis.
+    s = normalize_line(line.translate(_STRIP_TABLE))
+    if s.isascii():
+        return ()  # texto suelto: ningún emoji de equipo es ASCII
+    return split_graphemes_raw(s)
+
+
+# ----------------------------
+# Scoring — Formato PODIO (clásico)
+# ----------------------------
+def score_round_podio(lines: list[str], errors: list[str], rn: int, per_round: dict[int, dict]):
+    if not lines:
+        errors.append(f"Ronda {rn}: no tiene líneas.")
+        return
+
+    podium_raw = lines[0]
+    round_totals: Counter[str] = Counter()
+
+    # Podio vacío o solo ASCII (ej. "1. tba"): no puede traer emojis, ni se parsea
+    if podium_raw.isascii():
+        positions, podio_errors = (), ()
+        errors.append(f"Ronda {rn}: podio vacío o sin emojis en: '{podium_raw}'")
+    else:
+        positions, podio_errors = _parse_positions_line(podium_raw)
+        for pe in podio_errors:
+            errors.append(f"Ronda {rn}: {pe}")
+
+        # Validación: 3 posiciones
+        if len(positions) != 3:
+            errors.append(
+                f"Ronda {rn}: el podio debe tener EXACTAMENTE 3 posiciones (emojis sueltos o grupos), "
+                f"pero encontré {len(positions)} en: '{podium_raw}'"
+            )
+        else:
+            for pos_idx, pts in enumerate([100, 90, 80]):
+                for emo in positions[pos_idx]:
+                    round_totals[emo] += pts
+
+    # Resto de líneas: cada emoji vale 60. Counter cuenta todos los emojis
+    # de la ronda en C.
+    counts = Counter()
+    line_subtotals: list[tuple[str, int]] = []
+    for extra_line in lines[1:]:
+        emos = _emojis_in_nonpodium_line(extra_line)
+        counts.update(emos)
+        line_subtotals.append((extra_line, len(emos) * 60))
+    round_totals.update({emo: 60 * n for emo, n in counts.items()})
+
+    per_round[rn] = {
+        "positions": positions,
+        "errors": podio_errors,
+        "totals": round_totals,
+        "line_subtotals": line_subtotals,
+    }
+
+
+# ----------------------------
+# Scoring — Formato LINEAL (nuevo)
+# ----------------------------
+def score_round_lineal(lines: list[str], errors: list[str], rn: int, per_round: dict[int, dict]):
+    """
+    Formato lineal: cada ronda es una sola línea con N posiciones en orden.
+    - 1ra posición = 100 pts
+    - 2da posición = 90 pts
+    - 3ra posición = 80 pts
+    - 4ta en adelante = 60 pts c/u
+    Los paréntesis siguen siendo empates (ambos equipos reciben los mismos puntos).
+    """
+    if not lines:
+        errors.append(f"Ronda {rn}: no tiene líneas.")
+        return
+
+    line_raw = lines[0]
+    positions, line_errors = _parse_positions_line(line_raw)
+    for le in line_errors:
+        errors.append(f"Ronda {rn}: {le}")
+
+    round_totals: Counter[str] = Counter()
+
+    if not positions:
+        errors.append(f"Ronda {rn}: no se encontraron posiciones en: '{line_raw}'")
+
+    for pos_emojis, pts in zip(positions, [100, 90, 80]):
+        for emo in pos_emojis:
+            round_totals[emo] += pts
+
+    # 4ta posición en adelante: 60 c/u, contados de una vez con Counter
+    rest = Counter(itertools.chain.from_iterable(positions[3:]))
+    round_totals.update({emo: 60 * n for emo, n in rest.items()})
+
+    per_round[rn] = {
+        "positions": positions,
+        "errors": line_errors,
+        "totals": round_totals,
+        "line_subtotals": [],
+    }
+
+
+def compute_scores(rounds: dict[int, list[str]], fmt: str, sorted_rns: list[int] | None = None):
+    """
+    Regresa (totals, ranking, errors, per_round).
+    `rounds` debe venir de parse_input (líneas ya normalizadas).
+    totals es una lista con los puntos de cada equipo, en el orden de TEAM_ORDER.
+    per_round[ronda] guarda lo ya calculado para el debug, para no volver a parsear:
+      {"positions": ..., "errors": [...], "totals": {emoji: pts},
+       "line_subtotals": [(línea, pts), ...]}  # líneas extra (solo formato podio)
+    Las rondas sin líneas no aparecen en per_round.
+    Si el llamador ya tiene las rondas ordenadas, puede pasarlas en `sorted_rns`.
+    """
+    errors: list[str] = []
+    per_round: dict[int, dict] = {}
+
+    if sorted_rns is None:
+        sorted_rns = sorted(rounds.keys())
+
+    for rn in sorted_rns:
+        if fmt == "lineal":
+            score_round_lineal(rounds[rn], errors, rn, per_round)
+        else:
+            score_round_podio(rounds[rn], errors, rn, per_round)
+
+    # Un solo Counter suma todas las rondas; al final solo se puntúan los
+    # equipos (otros emojis quedan en el detalle de cada ronda)
+    all_points: Counter[str] = Counter()
+    for data in per_round.values():
+        all_points.update(data["totals"])
+    totals = [all_points[emo] for emo in TEAM_ORDER]
+
+    ranking = sorted(zip(TEAM_ORDER, totals), key=lambda x: (-x[1], x[0]))
+    return totals, ranking, errors, per_round
+
+
+def freeze_rounds(rounds: dict[int, list[str]],
+                  sorted_rns: list[int] | None = None) -> tuple[tuple[int, tuple[str, ...]], ...]:
+    """
+    Versión hasheable de `rounds` (ordenada por ronda) para poder usarla como llave de caché:
+    {1: ["❤️🧡🩶", "❤️"]} -> ((1, ("❤️🧡🩶", "❤️")),)
+    """
+    if sorted_rns is None:
+        sorted_rns = sorted(rounds.keys())
+    return tuple((rn, tuple(rounds[rn])) for rn in sorted_rns)
+
+
+# ----------------------------
+# Helpers (puntos / nombre dinámica / letras bonitas)
+# ----------------------------
+_THOUSANDS_DOT = str.maketrans(",", ".")
+
+
+@functools.lru_cache(maxsize=512)
+def format_points(n: int) -> str:
+    # 1680 -> "1.680" (se repiten mucho entre la salida y el debug)
+    n = int(n)
+    if -1000 < n < 1000:
+        # sin separador de miles
+        return str(n)
+    return f"{n:,}".translate(_THOUSANDS_DOT)
+
+
+@functools.lru_cache(maxsize=128)
+def extract_dynamic_name(title_raw: str) -> str:
+    """
+    "Ahorcado - Areli 🐧" -> "Ahorcado"
+    "Reloj de Arena - Yuls 🌙" -> "Reloj de Arena"
+    Si no hay '-', regresa el título completo.
+    """
+    t = normalize_line(title_raw)
+    if "-" in t:
+        left = t.split("-", 1)[0].strip()
+        return left if left else t
+    return t
+
+
+def strip_accents(s: str) -> str:
+    # "Dinámica" -> "Dinamica" (mejor para letras Unicode que no soportan acentos)
+    if s.isascii():
+        # ASCII no tiene acentos ni marcas que quitar
+        return s
+    decomposed = unicodedata.normalize("NFD", s)
+    no_marks = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+    if len(no_marks) == len(decomposed) and unicodedata.is_normalized("NFC", s):
+        # no se quitó nada y ya venía en NFC: recomponer daría lo mismo
+        return s
+    return unicodedata.normalize("NFC", no_marks)
+
+
+# Mapa a "letras bonitas" (Mathematical Bold Fraktur)
+FANCY_MAP = {
+    **{c: f for c, f in zip("ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+                            "𝕬𝕭𝕮𝕯𝕰𝕱𝕲𝕳𝕴𝕵𝕶𝕷𝕸𝕹𝕺𝕻𝕼𝕽𝕾𝕿𝖀𝖁𝖂𝖃𝖄𝖅")},
+    **{c: f for c, f in zip("abcdefghijklmnopqrstuvwxyz",
+                            "𝖆𝖇𝖈𝖉𝖊𝖋𝖌𝖍𝖎𝖏𝖐𝖑𝖒𝖓𝖔𝖕𝖖𝖗𝖘𝖙𝖚𝖛𝖜𝖝𝖞𝖟")},
+}
+# Tabla para str.translate: la sustitución corre completa en C, sin un get por letra
+FANCY_TRANS = str.maketrans(FANCY_MAP)
+
+
+@functools.lru_cache(maxsize=128)
+def to_fancy_text(s: str, remove_accents: bool = True) -> str:
+    base = strip_accents(s) if remove_accents else s
+    return base.translate(FANCY_TRANS)
+
+
+@functools.lru_cache(maxsize=128)
+def fancy_title(dynamic_name_plain: str) -> str:
+    # Nombre de la dinámica ya en letras bonitas; se calcula una vez por título
+    return to_fancy_text(dynamic_name_plain or "Dinamica", remove_accents=True)
\ No newline at end of file